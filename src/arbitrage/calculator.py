@@ -1,11 +1,174 @@
+import heapq
+import math
 from typing import Optional
 
+import numpy as np
+from numba import njit, prange
+
 from ..models.market import Platform
-from ..models.orderbook import Orderbook, OrderbookLevel
-from ..models.arbitrage import ArbitrageOpportunity, ArbitrageLevel
+from ..models.orderbook import Orderbook
+from ..models.arbitrage import ArbitrageOpportunity, LEVEL_DTYPE, PLATFORM_CODES
 from ..matching.fuzzy_matcher import MarketPair
 
 
+@njit(cache=True)
+def _walk_into(
+    yes_prices: np.ndarray,
+    yes_sizes: np.ndarray,
+    no_prices: np.ndarray,
+    no_sizes: np.ndarray,
+    min_profit_threshold: float,
+    out: np.ndarray,
+) -> int:
+    """
+    Two-pointer walk over ascending YES and NO ask levels.
+
+    Writes (yes_price, no_price, qty, total_cost, profit_pct) rows into
+    `out`, best first, and returns the number of rows written. `out` must
+    have room for len(yes_prices) + len(no_prices) rows, since each step
+    exhausts at least one level.
+    """
+    n_yes = yes_prices.shape[0]
+    n_no = no_prices.shape[0]
+    count = 0
+
+    # Track remaining quantity at each level
+    yes_remaining = yes_sizes.copy()
+    no_remaining = no_sizes.copy()
+
+    yes_idx = 0
+    no_idx = 0
+
+    while yes_idx < n_yes and no_idx < n_no:
+        yes_price = yes_prices[yes_idx]
+        no_price = no_prices[no_idx]
+
+        total_cost = yes_price + no_price
+        gross_profit_pct = 1.0 - total_cost
+
+        # Stop if no longer profitable
+        if gross_profit_pct < min_profit_threshold:
+            break
+
+        # Take the minimum quantity available
+        qty = min(yes_remaining[yes_idx], no_remaining[no_idx])
+
+        if qty > 0:
+            out[count, 0] = yes_price
+            out[count, 1] = no_price
+            out[count, 2] = qty
+            out[count, 3] = total_cost
+            out[count, 4] = gross_profit_pct
+            count += 1
+
+            # Update remaining quantities
+            yes_remaining[yes_idx] -= qty
+            no_remaining[no_idx] -= qty
+
+        # Move to next level if exhausted
+        if yes_remaining[yes_idx] <= 0:
+            yes_idx += 1
+        if no_remaining[no_idx] <= 0:
+            no_idx += 1
+
+    return count
+
+
+@njit(cache=True)
+def _walk_kernel(
+    yes_prices: np.ndarray,
+    yes_sizes: np.ndarray,
+    no_prices: np.ndarray,
+    no_sizes: np.ndarray,
+    min_profit_threshold: float,
+) -> np.ndarray:
+    """
+    Walk a single pair of ask books.
+
+    Returns a (k, 5) array of rows:
+    (yes_price, no_price, qty, total_cost, profit_pct), best first.
+    """
+    out = np.empty((yes_prices.shape[0] + no_prices.shape[0], 5), dtype=np.float64)
+    count = _walk_into(
+        yes_prices, yes_sizes, no_prices, no_sizes, min_profit_threshold, out
+    )
+    return out[:count]
+
+
+@njit(cache=True, parallel=True)
+def _walk_batch_kernel(
+    yes_prices: np.ndarray,
+    yes_sizes: np.ndarray,
+    yes_offsets: np.ndarray,
+    no_prices: np.ndarray,
+    no_sizes: np.ndarray,
+    no_offsets: np.ndarray,
+    min_profit_threshold: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Walk many pairs of ask books in one call.
+
+    Walk `w` reads levels [offsets[w], offsets[w + 1]) from the flat
+    YES and NO arrays. Returns (rows, row_offsets): walk `w`'s rows are
+    rows[row_offsets[w]:row_offsets[w + 1]].
+    """
+    n_walks = yes_offsets.shape[0] - 1
+
+    # Give each walk a region sized n_yes + n_no, its worst case
+    out_offsets = np.empty(n_walks + 1, dtype=np.int64)
+    out_offsets[0] = 0
+    for w in range(n_walks):
+        out_offsets[w + 1] = (
+            out_offsets[w]
+            + (yes_offsets[w + 1] - yes_offsets[w])
+            + (no_offsets[w + 1] - no_offsets[w])
+        )
+
+    out = np.empty((out_offsets[n_walks], 5), dtype=np.float64)
+    counts = np.zeros(n_walks, dtype=np.int64)
+
+    for w in prange(n_walks):
+        ys, ye = yes_offsets[w], yes_offsets[w + 1]
+        ns, ne = no_offsets[w], no_offsets[w + 1]
+        counts[w] = _walk_into(
+            yes_prices[ys:ye],
+            yes_sizes[ys:ye],
+            no_prices[ns:ne],
+            no_sizes[ns:ne],
+            min_profit_threshold,
+            out[out_offsets[w]:out_offsets[w + 1]],
+        )
+
+    # Compact the filled part of each region into contiguous rows
+    row_offsets = np.empty(n_walks + 1, dtype=np.int64)
+    row_offsets[0] = 0
+    for w in range(n_walks):
+        row_offsets[w + 1] = row_offsets[w] + counts[w]
+
+    rows = np.empty((row_offsets[n_walks], 5), dtype=np.float64)
+    for w in range(n_walks):
+        rows[row_offsets[w]:row_offsets[w + 1]] = (
+            out[out_offsets[w]:out_offsets[w] + counts[w]]
+        )
+
+    return rows, row_offsets
+
+
+# Stand-in prices/sizes for a strategy that is not walked
+_EMPTY_SIDE = np.empty(0, dtype=np.float64)
+
+
+def _flatten_levels(
+    sides: list[tuple[np.ndarray, np.ndarray]],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Concatenate (prices, sizes) sides into flat arrays plus offsets."""
+    prices = np.concatenate([side[0] for side in sides])
+    sizes = np.concatenate([side[1] for side in sides])
+    offsets = np.zeros(len(sides) + 1, dtype=np.int32)
+    np.cumsum([len(side[0]) for side in sides], out=offsets[1:])
+    return prices, sizes, offsets
+
+
 class ArbitrageCalculator:
     """Calculate arbitrage opportunities between matched markets."""
 
@@ -16,67 +179,118 @@ class ArbitrageCalculator:
         """
         self.min_profit_threshold = min_profit_threshold
 
+        # Compile the walk kernels now rather than on the first live pair
+        empty = np.zeros(0)
+        offsets = np.zeros(1, dtype=np.int32)
+        _walk_kernel(empty, empty, empty, empty, min_profit_threshold)
+        _walk_batch_kernel(
+            empty, empty, offsets, empty, empty, offsets, min_profit_threshold
+        )
+
+    @staticmethod
+    def _rows_to_levels(
+        rows: np.ndarray,
+        yes_plat: int | np.ndarray,
+        no_plat: int | np.ndarray,
+    ) -> np.ndarray:
+        """
+        Pack kernel output rows into a LEVEL_DTYPE array.
+
+        Platform codes may be scalars or per-row arrays.
+        """
+        levels = np.empty(len(rows), dtype=LEVEL_DTYPE)
+        levels["yes_price"] = rows[:, 0]
+        levels["no_price"] = rows[:, 1]
+        levels["qty"] = rows[:, 2]
+        levels["pct"] = rows[:, 4]
+        levels["max"] = rows[:, 2] * rows[:, 4]
+        levels["yes_plat"] = yes_plat
+        levels["no_plat"] = no_plat
+        return levels
+
+    @staticmethod
+    def _build_opportunity(
+        pair: MarketPair,
+        levels_1: np.ndarray,
+        levels_2: np.ndarray,
+    ) -> Optional[ArbitrageOpportunity]:
+        """Combine both strategies' levels into an opportunity, if any."""
+        # A walk only advances through ascending asks, so each strategy's
+        # total cost never decreases and its levels arrive best first.
+        # Only when both strategies are profitable do they need merging.
+        if not len(levels_2):
+            all_levels = levels_1
+        elif not len(levels_1):
+            all_levels = levels_2
+        else:
+            all_levels = np.concatenate((levels_1, levels_2))
+            all_levels = all_levels[np.argsort(-all_levels["pct"], kind="stable")]
+
+        if not len(all_levels):
+            return None
+
+        return ArbitrageOpportunity(
+            kalshi_market=pair.kalshi_market,
+            poly_market=pair.poly_market,
+            match_score=pair.match_score,
+            levels=all_levels,
+        )
+
+    @staticmethod
+    def best_total_cost(
+        kalshi_orderbook: Orderbook, poly_orderbook: Orderbook
+    ) -> float:
+        """
+        Cheapest YES + NO cost across both strategies at the best asks.
+
+        Returns inf if neither strategy has both sides quoted.
+        """
+        costs = [
+            yes_ask + no_ask
+            for yes_ask, no_ask in (
+                (kalshi_orderbook.best_yes_ask, poly_orderbook.best_no_ask),
+                (poly_orderbook.best_yes_ask, kalshi_orderbook.best_no_ask),
+            )
+            if yes_ask is not None and no_ask is not None
+        ]
+        return min(costs, default=math.inf)
+
+    def _can_arb(self, yes_prices: np.ndarray, no_prices: np.ndarray) -> bool:
+        """
+        Check whether the best asks leave room for any profitable level.
+
+        Asks are ascending, so if the cheapest YES + NO is below the
+        threshold, every deeper combination is too.
+        """
+        return bool(
+            yes_prices.size
+            and no_prices.size
+            and 1.0 - (yes_prices[0] + no_prices[0]) >= self.min_profit_threshold
+        )
+
     def _walk_orderbook(
         self,
-        yes_asks: list[OrderbookLevel],
-        no_asks: list[OrderbookLevel],
+        yes_prices: np.ndarray,
+        yes_sizes: np.ndarray,
+        no_prices: np.ndarray,
+        no_sizes: np.ndarray,
         yes_platform: Platform,
         no_platform: Platform,
-    ) -> list[ArbitrageLevel]:
+    ) -> np.ndarray:
         """
         Walk through orderbook levels and find all profitable combinations.
 
-        Returns list of ArbitrageLevel sorted by profit (best first).
+        Returns a LEVEL_DTYPE array sorted by profit (best first).
         """
-        levels = []
-
-        # Track remaining quantity at each level
-        yes_remaining = [(lvl.price, lvl.size) for lvl in yes_asks]
-        no_remaining = [(lvl.price, lvl.size) for lvl in no_asks]
-
-        yes_idx = 0
-        no_idx = 0
-
-        while yes_idx < len(yes_remaining) and no_idx < len(no_remaining):
-            yes_price, yes_qty = yes_remaining[yes_idx]
-            no_price, no_qty = no_remaining[no_idx]
-
-            total_cost = yes_price + no_price
-            gross_profit_pct = 1.0 - total_cost
-
-            # Stop if no longer profitable
-            if gross_profit_pct < self.min_profit_threshold:
-                break
-
-            # Take the minimum quantity available
-            qty = min(yes_qty, no_qty)
-
-            if qty > 0:
-                # Calculate profit in dollars for this level
-                max_profit_dollars = qty * gross_profit_pct
-
-                levels.append(ArbitrageLevel(
-                    buy_yes_platform=yes_platform,
-                    buy_yes_price=yes_price,
-                    buy_no_platform=no_platform,
-                    buy_no_price=no_price,
-                    quantity=qty,
-                    total_cost=total_cost,
-                    profit_percentage=gross_profit_pct,
-                    max_profit_dollars=max_profit_dollars,
-                ))
-
-                # Update remaining quantities
-                yes_remaining[yes_idx] = (yes_price, yes_qty - qty)
-                no_remaining[no_idx] = (no_price, no_qty - qty)
-
-            # Move to next level if exhausted
-            if yes_remaining[yes_idx][1] <= 0:
-                yes_idx += 1
-            if no_remaining[no_idx][1] <= 0:
-                no_idx += 1
+        if not self._can_arb(yes_prices, no_prices):
+            return np.empty(0, dtype=LEVEL_DTYPE)
 
-        return levels
+        rows = _walk_kernel(
+            yes_prices, yes_sizes, no_prices, no_sizes, self.min_profit_threshold
+        )
+        return self._rows_to_levels(
+            rows, PLATFORM_CODES[yes_platform], PLATFORM_CODES[no_platform]
+        )
 
     def calculate_opportunity(
         self,
@@ -91,53 +305,120 @@ class ArbitrageCalculator:
         1. Buy YES on Kalshi + Buy NO on Polymarket
         2. Buy YES on Polymarket + Buy NO on Kalshi
         """
+        if not (
+            self._can_arb(kalshi_orderbook.yes_ask_prices, poly_orderbook.no_ask_prices)
+            or self._can_arb(
+                poly_orderbook.yes_ask_prices, kalshi_orderbook.no_ask_prices
+            )
+        ):
+            return None
+
         # Strategy 1: YES on Kalshi + NO on Polymarket
         levels_1 = self._walk_orderbook(
-            kalshi_orderbook.yes_asks,
-            poly_orderbook.no_asks,
+            kalshi_orderbook.yes_ask_prices,
+            kalshi_orderbook.yes_ask_sizes,
+            poly_orderbook.no_ask_prices,
+            poly_orderbook.no_ask_sizes,
             Platform.KALSHI,
             Platform.POLYMARKET,
         )
 
         # Strategy 2: YES on Polymarket + NO on Kalshi
         levels_2 = self._walk_orderbook(
-            poly_orderbook.yes_asks,
-            kalshi_orderbook.no_asks,
+            poly_orderbook.yes_ask_prices,
+            poly_orderbook.yes_ask_sizes,
+            kalshi_orderbook.no_ask_prices,
+            kalshi_orderbook.no_ask_sizes,
             Platform.POLYMARKET,
             Platform.KALSHI,
         )
 
-        # Combine all levels and sort by profit percentage (best first)
-        all_levels = levels_1 + levels_2
-        all_levels.sort(key=lambda x: x.profit_percentage, reverse=True)
-
-        if not all_levels:
-            return None
-
-        return ArbitrageOpportunity(
-            kalshi_market=pair.kalshi_market,
-            poly_market=pair.poly_market,
-            match_score=pair.match_score,
-            levels=all_levels,
-        )
+        return self._build_opportunity(pair, levels_1, levels_2)
 
     def find_all_opportunities(
         self,
         pairs: list[MarketPair],
         kalshi_orderbooks: dict[str, Orderbook],
         poly_orderbooks: dict[str, Orderbook],
+        top_k: int = 0,
     ) -> list[ArbitrageOpportunity]:
-        """Find all arbitrage opportunities from matched pairs."""
-        opportunities = []
+        """
+        Find all arbitrage opportunities from matched pairs.
+
+        Every strategy of every pair is walked in a single batched kernel
+        call; pair p's two strategies are walks 2p and 2p + 1.
+
+        Args:
+            top_k: Only return the K most profitable opportunities (0 = all)
+        """
+        walked_pairs = []
+        yes_sides = []
+        no_sides = []
 
         for pair in pairs:
             kalshi_book = kalshi_orderbooks.get(pair.kalshi_market.market_id)
             poly_book = poly_orderbooks.get(pair.poly_market.market_id)
 
-            if kalshi_book and poly_book:
-                opp = self.calculate_opportunity(pair, kalshi_book, poly_book)
-                if opp:
-                    opportunities.append(opp)
+            if not (kalshi_book and poly_book):
+                continue
+
+            # Strategy 1: YES on Kalshi + NO on Polymarket
+            # Strategy 2: YES on Polymarket + NO on Kalshi
+            strategies = [
+                (
+                    (kalshi_book.yes_ask_prices, kalshi_book.yes_ask_sizes),
+                    (poly_book.no_ask_prices, poly_book.no_ask_sizes),
+                ),
+                (
+                    (poly_book.yes_ask_prices, poly_book.yes_ask_sizes),
+                    (kalshi_book.no_ask_prices, kalshi_book.no_ask_sizes),
+                ),
+            ]
+            viable = [self._can_arb(yes[0], no[0]) for yes, no in strategies]
+            if not any(viable):
+                continue
+
+            walked_pairs.append(pair)
+            for (yes, no), ok in zip(strategies, viable):
+                # A strategy whose best asks cannot arb walks empty sides
+                yes_sides.append(yes if ok else (_EMPTY_SIDE, _EMPTY_SIDE))
+                no_sides.append(no if ok else (_EMPTY_SIDE, _EMPTY_SIDE))
+
+        if not walked_pairs:
+            return []
+
+        rows, row_offsets = _walk_batch_kernel(
+            *_flatten_levels(yes_sides),
+            *_flatten_levels(no_sides),
+            self.min_profit_threshold,
+        )
+
+        # Pack every walk's rows at once; walks alternate between strategies
+        kalshi_code = PLATFORM_CODES[Platform.KALSHI]
+        poly_code = PLATFORM_CODES[Platform.POLYMARKET]
+        walk_sizes = np.diff(row_offsets)
+        levels = self._rows_to_levels(
+            rows,
+            np.repeat(np.tile([kalshi_code, poly_code], len(walked_pairs)), walk_sizes),
+            np.repeat(np.tile([poly_code, kalshi_code], len(walked_pairs)), walk_sizes),
+        )
+
+        opportunities = []
+
+        for p, pair in enumerate(walked_pairs):
+            start, mid, end = row_offsets[2 * p:2 * p + 3]
+            if start == end:
+                continue
+
+            opp = self._build_opportunity(
+                pair, levels[start:mid], levels[mid:end]
+            )
+            if opp:
+                opportunities.append(opp)
 
         # Sort by best profit percentage descending
+        if top_k:
+            return heapq.nlargest(
+                top_k, opportunities, key=lambda x: x.best_profit_percentage
+            )
         return sorted(opportunities, key=lambda x: x.best_profit_percentage, reverse=True)
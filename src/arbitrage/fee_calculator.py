@@ -58,12 +58,12 @@ class FeeCalculator:
         kalshi_fee = 0.0
         poly_fee = 0.0
 
-        if buy_yes_platform == Platform.KALSHI:
+        if buy_yes_platform is Platform.KALSHI:
             kalshi_fee += cls.kalshi_taker_fee(contracts, buy_yes_price)
         else:
             poly_fee += cls.polymarket_taker_fee(contracts, buy_yes_price)
 
-        if buy_no_platform == Platform.KALSHI:
+        if buy_no_platform is Platform.KALSHI:
             kalshi_fee += cls.kalshi_taker_fee(contracts, buy_no_price)
         else:
             poly_fee += cls.polymarket_taker_fee(contracts, buy_no_price)
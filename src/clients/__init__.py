@@ -1,4 +1,5 @@
+from .http import create_http_client
 from .kalshi_client import KalshiClient
 from .polymarket_client import PolymarketClient
 
-__all__ = ["KalshiClient", "PolymarketClient"]
+__all__ = ["KalshiClient", "PolymarketClient", "create_http_client"]
@@ -0,0 +1,10 @@
+import httpx
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create the HTTP/2 client the platform clients send requests through."""
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        timeout=30.0,
+    )
@@ -5,28 +5,36 @@ from typing import Optional
 from datetime import datetime
 
 import httpx
-from cryptography.hazmat.primitives import hashes, serialization
+import numpy as np
+import orjson
+from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric import padding, rsa
 
 from ..models.market import UnifiedMarket, Platform
-from ..models.orderbook import Orderbook, OrderbookLevel
+from ..models.orderbook import Orderbook
+from .http import create_http_client
+
+
+# ETag, parsed markets and next cursor of a market page
+_CachedPage = tuple[str, list[UnifiedMarket], Optional[str]]
 
 
 class RateLimiter:
-    """Simple token bucket rate limiter."""
+    """Rate limiter handing out evenly spaced request slots."""
 
     def __init__(self, requests_per_second: float):
         self.interval = 1.0 / requests_per_second
-        self._last_request = 0.0
-        self._lock = asyncio.Lock()
+        self._next_allowed = 0.0
 
     async def acquire(self):
-        async with self._lock:
-            now = time.monotonic()
-            wait_time = self._last_request + self.interval - now
-            if wait_time > 0:
-                await asyncio.sleep(wait_time)
-            self._last_request = time.monotonic()
+        # Claim the next slot before awaiting; there is no await between
+        # the read and the update, so concurrent tasks never share a slot
+        now = time.monotonic()
+        slot = max(self._next_allowed, now)
+        self._next_allowed = slot + self.interval
+        wait_time = slot - now
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
 
 
 class KalshiClient:
@@ -35,36 +43,71 @@ class KalshiClient:
     def __init__(
         self,
         api_key_id: str,
-        private_key_pem: str,
+        private_key: rsa.RSAPrivateKey,
         base_url: str = "https://api.elections.kalshi.com/trade-api/v2",
         requests_per_second: float = 5.0,
+        keep_raw: bool = False,
+        http_client: Optional[httpx.AsyncClient] = None,
+        orderbook_cache_size: int = 2048,
     ):
+        """
+        Args:
+            private_key: Parsed RSA private key used to sign requests
+            keep_raw: Keep each market's raw JSON payload on UnifiedMarket.raw_data
+            http_client: Shared HTTP client to send requests through; the
+                caller owns it and must close it. A private one is created
+                if omitted.
+            orderbook_cache_size: Most orderbooks kept for ETag
+                revalidation; the least recently used are dropped first
+        """
         self.api_key_id = api_key_id
         self.base_url = base_url.rstrip("/")
         self.rate_limiter = RateLimiter(requests_per_second)
+        self.keep_raw = keep_raw
+        self.private_key = private_key
 
-        # Load RSA private key
-        self.private_key: rsa.RSAPrivateKey = serialization.load_pem_private_key(
-            private_key_pem.encode(), password=None
+        # Signing parameters are immutable, so build them once
+        self._pss = padding.PSS(
+            mgf=padding.MGF1(hashes.SHA256()),
+            salt_length=padding.PSS.MAX_LENGTH,
         )
-
-        self._client = httpx.AsyncClient(timeout=30.0)
+        self._sha = hashes.SHA256()
+        # Last signing timestamp as (milliseconds, str, bytes)
+        self._ts_cache: tuple[int, str, bytes] = (0, "", b"")
+        # Signatures made during that millisecond by (method, path)
+        self._sig_cache: dict[tuple[str, str], str] = {}
+
+        # ETag-validated responses: market pages by (status, cursor) and
+        # orderbooks by (ticker, depth), the latter in least recently used
+        # first order
+        self._page_cache: dict[tuple[str, str], _CachedPage] = {}
+        self._orderbook_cache: dict[tuple[str, int], tuple[str, Orderbook]] = {}
+        self._orderbook_cache_size = orderbook_cache_size
+
+        # HTTP/2 lets concurrent orderbook requests share a few connections
+        self._owns_client = http_client is None
+        self._client = http_client or create_http_client()
 
     def _sign_request(self, method: str, path: str) -> tuple[str, str]:
         """Generate RSA-PSS signature for request."""
-        timestamp_ms = str(int(time.time() * 1000))
-        message = f"{timestamp_ms}{method}{path}"
-
-        signature = self.private_key.sign(
-            message.encode("utf-8"),
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.MAX_LENGTH,
-            ),
-            hashes.SHA256(),
-        )
-
-        return timestamp_ms, base64.b64encode(signature).decode("utf-8")
+        # Bursts of requests share a millisecond, so format it once per tick
+        # and reuse signatures for repeated (method, path) within it
+        now_ms = int(time.time() * 1000)
+        if now_ms != self._ts_cache[0]:
+            timestamp = str(now_ms)
+            self._ts_cache = (now_ms, timestamp, timestamp.encode())
+            self._sig_cache.clear()
+        _, timestamp_ms, timestamp_bytes = self._ts_cache
+
+        key = (method, path)
+        encoded = self._sig_cache.get(key)
+        if encoded is None:
+            message = b"%s%s%s" % (timestamp_bytes, method.encode(), path.encode())
+            signature = self.private_key.sign(message, self._pss, self._sha)
+            encoded = base64.b64encode(signature).decode("utf-8")
+            self._sig_cache[key] = encoded
+
+        return timestamp_ms, encoded
 
     def _get_auth_headers(self, method: str, path: str) -> dict[str, str]:
         """Generate authentication headers for a request."""
@@ -76,13 +119,51 @@ class KalshiClient:
             "Content-Type": "application/json",
         }
 
+    def _parse_market(self, m: dict) -> UnifiedMarket:
+        """Build a UnifiedMarket from a Kalshi market payload."""
+        close_time = None
+        if m.get("close_time"):
+            try:
+                close_time = datetime.fromisoformat(
+                    m["close_time"].replace("Z", "+00:00")
+                )
+            except (ValueError, TypeError):
+                pass
+
+        # Get best prices from the market data
+        yes_ask = None
+        no_ask = None
+
+        # Kalshi prices are in cents (0-100)
+        if m.get("yes_ask"):
+            yes_ask = m["yes_ask"] / 100.0
+        if m.get("no_ask"):
+            no_ask = m["no_ask"] / 100.0
+
+        return UnifiedMarket(
+            platform=Platform.KALSHI,
+            market_id=m["ticker"],
+            title=m.get("title", ""),
+            close_time=close_time,
+            yes_ask=yes_ask,
+            no_ask=no_ask,
+            event_ticker=m.get("event_ticker") or None,
+            raw_data=m if self.keep_raw else None,
+        )
+
     async def get_markets(
         self, status: str = "open", max_markets: int = 0
     ) -> list[UnifiedMarket]:
-        """Fetch open markets from Kalshi with pagination."""
+        """
+        Fetch open markets from Kalshi with pagination.
+
+        Pages are revalidated with their ETag; a 304 reuses the page's
+        markets from the previous call without parsing anything.
+        """
         markets = []
         cursor: Optional[str] = None
         path = "/markets"
+        page_cache: dict[tuple[str, str], _CachedPage] = {}
 
         while max_markets == 0 or len(markets) < max_markets:
             await self.rate_limiter.acquire()
@@ -93,103 +174,116 @@ class KalshiClient:
 
             headers = self._get_auth_headers("GET", path)
 
+            cache_key = (status, cursor or "")
+            cached = self._page_cache.get(cache_key)
+            if cached:
+                headers["If-None-Match"] = cached[0]
+
             response = await self._client.get(
                 f"{self.base_url}{path}", headers=headers, params=params
             )
-            response.raise_for_status()
-            data = response.json()
-
-            for m in data.get("markets", []):
-                close_time = None
-                if m.get("close_time"):
-                    try:
-                        close_time = datetime.fromisoformat(
-                            m["close_time"].replace("Z", "+00:00")
-                        )
-                    except (ValueError, TypeError):
-                        pass
-
-                # Get best prices from the market data
-                yes_ask = None
-                no_ask = None
-
-                # Kalshi prices are in cents (0-100)
-                if m.get("yes_ask"):
-                    yes_ask = m["yes_ask"] / 100.0
-                if m.get("no_ask"):
-                    no_ask = m["no_ask"] / 100.0
-
-                markets.append(
-                    UnifiedMarket(
-                        platform=Platform.KALSHI,
-                        market_id=m["ticker"],
-                        title=m.get("title", ""),
-                        close_time=close_time,
-                        yes_ask=yes_ask,
-                        no_ask=no_ask,
-                        raw_data=m,
-                    )
-                )
 
-            cursor = data.get("cursor")
+            if cached and response.status_code == 304:
+                _, page_markets, cursor = cached
+            else:
+                response.raise_for_status()
+                data = orjson.loads(response.content)
+                page_markets = [self._parse_market(m) for m in data.get("markets", [])]
+                cursor = data.get("cursor")
+
+            etag = response.headers.get("ETag") or (cached[0] if cached else None)
+            if etag:
+                page_cache[cache_key] = (etag, page_markets, cursor)
+
+            markets.extend(page_markets)
             if not cursor:
                 break
 
+        # Keep only the pages seen this time so stale cursors do not pile up
+        self._page_cache = page_cache
         return markets
 
+    @staticmethod
+    def _parse_bids(raw_levels: list) -> tuple[np.ndarray, np.ndarray]:
+        """Parse [price_cents, size] bid levels into ascending price/size arrays."""
+        levels = np.array(
+            [lvl[:2] for lvl in raw_levels if isinstance(lvl, list) and len(lvl) >= 2],
+            dtype=np.float64,
+        ).reshape(-1, 2)
+        # A null price or size converts to NaN rather than raising; skip it
+        levels = levels[np.isfinite(levels).all(axis=1)]
+
+        # Kalshi sends bids in ascending price order; only sort when a
+        # linear check says otherwise
+        prices = levels[:, 0]
+        if not (prices[1:] >= prices[:-1]).all():
+            levels = levels[np.argsort(prices, kind="stable")]
+        return levels[:, 0] / 100.0, levels[:, 1]
+
     async def get_orderbook(self, ticker: str, depth: int = 10) -> Orderbook:
-        """Fetch orderbook for a Kalshi market."""
+        """Fetch orderbook for a Kalshi market, revalidating by ETag."""
         await self.rate_limiter.acquire()
 
         path = f"/markets/{ticker}/orderbook"
         headers = self._get_auth_headers("GET", path)
 
+        cache_key = (ticker, depth)
+        cached = self._orderbook_cache.get(cache_key)
+        if cached:
+            headers["If-None-Match"] = cached[0]
+
         response = await self._client.get(
             f"{self.base_url}{path}", headers=headers, params={"depth": depth}
         )
+        if cached and response.status_code == 304:
+            self._cache_orderbook(cache_key, cached)
+            return cached[1]
+
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
 
         orderbook_data = data.get("orderbook") or {}
 
         # Kalshi returns yes and no bids only
         # A yes bid at price P is equivalent to a no ask at (1-P)
-        yes_bids = []
-        no_bids = []
-
-        for level in orderbook_data.get("yes") or []:
-            if isinstance(level, list) and len(level) >= 2:
-                price, size = level[0] / 100.0, level[1]
-                yes_bids.append(OrderbookLevel(price=price, size=size))
-
-        for level in orderbook_data.get("no") or []:
-            if isinstance(level, list) and len(level) >= 2:
-                price, size = level[0] / 100.0, level[1]
-                no_bids.append(OrderbookLevel(price=price, size=size))
-
-        # Derive asks from opposite side bids
-        # YES ask = 1 - NO bid, NO ask = 1 - YES bid
-        yes_asks = [
-            OrderbookLevel(price=1.0 - lvl.price, size=lvl.size) for lvl in no_bids
-        ]
-        no_asks = [
-            OrderbookLevel(price=1.0 - lvl.price, size=lvl.size) for lvl in yes_bids
-        ]
-
-        # Sort: bids descending, asks ascending
-        yes_bids.sort(key=lambda x: x.price, reverse=True)
-        yes_asks.sort(key=lambda x: x.price)
-        no_bids.sort(key=lambda x: x.price, reverse=True)
-        no_asks.sort(key=lambda x: x.price)
-
-        return Orderbook(
+        yes_prices, yes_sizes = self._parse_bids(orderbook_data.get("yes") or [])
+        no_prices, no_sizes = self._parse_bids(orderbook_data.get("no") or [])
+
+        # With bids ascending, reversing gives bids descending, and the
+        # derived asks (YES ask = 1 - NO bid, NO ask = 1 - YES bid) of the
+        # reversed bids come out ascending, so no further sorting is needed
+        yes_prices, yes_sizes = yes_prices[::-1].copy(), yes_sizes[::-1].copy()
+        no_prices, no_sizes = no_prices[::-1].copy(), no_sizes[::-1].copy()
+
+        orderbook = Orderbook(
             market_id=ticker,
-            yes_bids=yes_bids,
-            yes_asks=yes_asks,
-            no_bids=no_bids,
-            no_asks=no_asks,
+            yes_bid_prices=yes_prices,
+            yes_bid_sizes=yes_sizes,
+            yes_ask_prices=1.0 - no_prices,
+            yes_ask_sizes=no_sizes,
+            no_bid_prices=no_prices,
+            no_bid_sizes=no_sizes,
+            no_ask_prices=1.0 - yes_prices,
+            no_ask_sizes=yes_sizes,
         )
 
+        etag = response.headers.get("ETag")
+        if etag:
+            self._cache_orderbook(cache_key, (etag, orderbook))
+
+        return orderbook
+
+    def _cache_orderbook(
+        self, cache_key: tuple[str, int], entry: tuple[str, Orderbook]
+    ):
+        """Store an orderbook as most recently used, evicting the oldest."""
+        cache = self._orderbook_cache
+        cache.pop(cache_key, None)
+        cache[cache_key] = entry
+        while len(cache) > self._orderbook_cache_size:
+            del cache[next(iter(cache))]
+
     async def close(self):
-        """Close the HTTP client."""
-        await self._client.aclose()
+        """Close the HTTP client, unless it was passed in."""
+        if self._owns_client:
+            await self._client.aclose()
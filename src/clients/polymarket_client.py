@@ -3,31 +3,41 @@ import hmac
 import base64
 import hashlib
 import asyncio
-import json
-from typing import Optional
+from typing import Optional, Any
 from datetime import datetime
 
 import httpx
+import numpy as np
+import orjson
 
 from ..models.market import UnifiedMarket, Platform
-from ..models.orderbook import Orderbook, OrderbookLevel
+from ..models.orderbook import Orderbook
+from .http import create_http_client
+
+
+# ETag, parsed markets and raw entry count of a market page
+_CachedPage = tuple[str, list[UnifiedMarket], int]
+
+# Token books requested per bulk /books call
+_BOOKS_BATCH_SIZE = 100
 
 
 class RateLimiter:
-    """Simple token bucket rate limiter."""
+    """Rate limiter handing out evenly spaced request slots."""
 
     def __init__(self, requests_per_second: float):
         self.interval = 1.0 / requests_per_second
-        self._last_request = 0.0
-        self._lock = asyncio.Lock()
+        self._next_allowed = 0.0
 
     async def acquire(self):
-        async with self._lock:
-            now = time.monotonic()
-            wait_time = self._last_request + self.interval - now
-            if wait_time > 0:
-                await asyncio.sleep(wait_time)
-            self._last_request = time.monotonic()
+        # Claim the next slot before awaiting; there is no await between
+        # the read and the update, so concurrent tasks never share a slot
+        now = time.monotonic()
+        slot = max(self._next_allowed, now)
+        self._next_allowed = slot + self.interval
+        wait_time = slot - now
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
 
 
 class PolymarketClient:
@@ -41,20 +51,36 @@ class PolymarketClient:
         secret: Optional[str] = None,
         passphrase: Optional[str] = None,
         requests_per_second: float = 10.0,
+        keep_raw: bool = False,
+        http_client: Optional[httpx.AsyncClient] = None,
     ):
+        """
+        Args:
+            keep_raw: Keep each market's raw JSON payload on UnifiedMarket.raw_data
+            http_client: Shared HTTP client to send requests through; the
+                caller owns it and must close it. A private one is created
+                if omitted.
+        """
         self.clob_url = clob_url.rstrip("/")
         self.gamma_url = gamma_url.rstrip("/")
         self.api_key = api_key
         self.secret = secret
         self.passphrase = passphrase
         self.rate_limiter = RateLimiter(requests_per_second)
+        self.keep_raw = keep_raw
 
-        self._client = httpx.AsyncClient(timeout=30.0)
+        # HTTP/2 lets concurrent orderbook requests share a few connections
+        self._owns_client = http_client is None
+        self._client = http_client or create_http_client()
 
         # Cache for token_id to market_id mapping
         self._token_to_market: dict[str, tuple[str, str]] = {}
         # Cache for market_id to token IDs
         self._market_tokens: dict[str, tuple[str, str]] = {}
+        # Last signing timestamp as (seconds, str, bytes)
+        self._ts_cache: tuple[int, str, bytes] = (0, "", b"")
+        # ETag-validated market pages by (active_only, offset)
+        self._page_cache: dict[tuple[bool, int], _CachedPage] = {}
 
     def _sign_request(
         self, method: str, path: str, body: str = ""
@@ -63,15 +89,25 @@ class PolymarketClient:
         if not self.api_key or not self.secret or not self.passphrase:
             return {}
 
-        timestamp = str(int(time.time()))
+        # POLY_TIMESTAMP has seconds precision, so format it once per second
+        now = int(time.time())
+        if now != self._ts_cache[0]:
+            timestamp = str(now)
+            self._ts_cache = (now, timestamp, timestamp.encode())
+        _, timestamp, timestamp_bytes = self._ts_cache
 
         # Message to sign: timestamp + method + path + body
-        message = f"{timestamp}{method.upper()}{path}{body}"
+        message = b"%s%s%s%s" % (
+            timestamp_bytes,
+            method.upper().encode(),
+            path.encode(),
+            body.encode(),
+        )
 
         # HMAC-SHA256 signature
         signature = hmac.new(
             base64.b64decode(self.secret),
-            message.encode("utf-8"),
+            message,
             hashlib.sha256,
         ).digest()
 
@@ -82,11 +118,73 @@ class PolymarketClient:
             "POLY_SIGNATURE": base64.b64encode(signature).decode("utf-8"),
         }
 
+    def _parse_market(self, m: dict[str, Any]) -> Optional[UnifiedMarket]:
+        """Parse a Gamma market, or None if it is not tradeable."""
+        # Skip markets that aren't actually tradeable
+        if not m.get("enableOrderBook") or not m.get("acceptingOrders"):
+            return None
+
+        # Get token IDs for YES and NO from clobTokenIds
+        # clobTokenIds is a JSON string that needs to be parsed
+        clob_token_ids_raw = m.get("clobTokenIds", "[]")
+        try:
+            if isinstance(clob_token_ids_raw, str):
+                clob_token_ids = orjson.loads(clob_token_ids_raw)
+            else:
+                clob_token_ids = clob_token_ids_raw or []
+        except (orjson.JSONDecodeError, TypeError):
+            return None
+
+        if len(clob_token_ids) < 2:
+            return None
+
+        # Convention: first token is YES, second is NO
+        yes_token = clob_token_ids[0]
+        no_token = clob_token_ids[1]
+
+        # Parse close time
+        close_time = None
+        end_date = m.get("endDate")
+        if end_date:
+            try:
+                close_time = datetime.fromisoformat(end_date.replace("Z", "+00:00"))
+            except (ValueError, TypeError):
+                pass
+
+        condition_id = m.get("conditionId", "")
+
+        # Polymarket markets are often part of event groups;
+        # fall back to the market's own slug
+        events = m.get("events") or []
+        event_slug = (events[0].get("slug") if events else None) or m.get("slug")
+
+        # Cache token mappings
+        self._token_to_market[yes_token] = (condition_id, "yes")
+        self._token_to_market[no_token] = (condition_id, "no")
+        self._market_tokens[condition_id] = (yes_token, no_token)
+
+        return UnifiedMarket(
+            platform=Platform.POLYMARKET,
+            market_id=condition_id,
+            title=m.get("question", ""),
+            yes_token_id=yes_token,
+            no_token_id=no_token,
+            close_time=close_time,
+            event_slug=event_slug or None,
+            raw_data=m if self.keep_raw else None,
+        )
+
     async def get_markets(self, active_only: bool = True) -> list[UnifiedMarket]:
-        """Fetch markets from Gamma API with metadata."""
+        """
+        Fetch markets from Gamma API with metadata.
+
+        Pages are revalidated with their ETag; a 304 reuses the page's
+        markets from the previous call without parsing anything.
+        """
         markets = []
         offset = 0
         limit = 100
+        page_cache: dict[tuple[bool, int], _CachedPage] = {}
 
         while True:
             await self.rate_limiter.acquire()
@@ -99,161 +197,189 @@ class PolymarketClient:
                 params["active"] = "true"
                 params["closed"] = "false"
 
+            headers = {}
+            cache_key = (active_only, offset)
+            cached = self._page_cache.get(cache_key)
+            if cached:
+                headers["If-None-Match"] = cached[0]
+
             response = await self._client.get(
-                f"{self.gamma_url}/markets", params=params
+                f"{self.gamma_url}/markets", headers=headers, params=params
             )
-            response.raise_for_status()
-            data = response.json()
 
-            if not data:
+            if cached and response.status_code == 304:
+                _, page_markets, page_size = cached
+            else:
+                response.raise_for_status()
+                data = orjson.loads(response.content)
+                page_size = len(data)
+                page_markets = [
+                    market
+                    for market in map(self._parse_market, data)
+                    if market is not None
+                ]
+
+            etag = response.headers.get("ETag") or (cached[0] if cached else None)
+            if etag:
+                page_cache[cache_key] = (etag, page_markets, page_size)
+
+            markets.extend(page_markets)
+            offset += limit
+            if page_size < limit:
                 break
 
-            for m in data:
-                # Skip markets that aren't actually tradeable
-                if not m.get("enableOrderBook") or not m.get("acceptingOrders"):
-                    continue
+        # Keep only the pages seen this time so stale offsets do not pile up
+        self._page_cache = page_cache
+        return markets
 
-                # Get token IDs for YES and NO from clobTokenIds
-                # clobTokenIds is a JSON string that needs to be parsed
-                clob_token_ids_raw = m.get("clobTokenIds", "[]")
+    @staticmethod
+    def _parse_levels(
+        entries: list[dict[str, Any]], descending: bool
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Parse CLOB price/size entries into price/size arrays sorted by price."""
+        try:
+            levels = np.array(
+                [(e.get("price", 0), e.get("size", 0)) for e in entries],
+                dtype=np.float64,
+            ).reshape(-1, 2)
+        except (ValueError, TypeError, AttributeError):
+            # Malformed entry somewhere; parse one by one and skip bad ones
+            parsed = []
+            for e in entries:
                 try:
-                    if isinstance(clob_token_ids_raw, str):
-                        clob_token_ids = json.loads(clob_token_ids_raw)
-                    else:
-                        clob_token_ids = clob_token_ids_raw or []
-                except (json.JSONDecodeError, TypeError):
-                    continue
-
-                if len(clob_token_ids) < 2:
+                    parsed.append((float(e.get("price", 0)), float(e.get("size", 0))))
+                except (ValueError, TypeError, AttributeError):
                     continue
+            levels = np.array(parsed, dtype=np.float64).reshape(-1, 2)
+
+        # A null price or size converts to NaN rather than raising; skip it
+        levels = levels[np.isfinite(levels).all(axis=1)]
+
+        # The CLOB returns each side best level last (bids ascending, asks
+        # descending), so reversing usually gives the wanted order; only
+        # truly unordered input needs a sort
+        keys = -levels[:, 0] if descending else levels[:, 0]
+        if (keys[1:] <= keys[:-1]).all():
+            levels = levels[::-1]
+        elif not (keys[1:] >= keys[:-1]).all():
+            levels = levels[np.argsort(keys, kind="stable")]
+        return levels[:, 0].copy(), levels[:, 1].copy()
+
+    def _tokens(self, market: UnifiedMarket) -> Optional[tuple[str, str]]:
+        """YES and NO token IDs of a market, falling back to the cache."""
+        if market.yes_token_id and market.no_token_id:
+            return market.yes_token_id, market.no_token_id
+        return self._market_tokens.get(market.market_id)
+
+    async def _fetch_books(self, token_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Fetch CLOB books for tokens in one /books request, by asset_id."""
+        await self.rate_limiter.acquire()
 
-                # Convention: first token is YES, second is NO
-                yes_token = clob_token_ids[0]
-                no_token = clob_token_ids[1]
-
-                # Parse close time
-                close_time = None
-                end_date = m.get("endDate")
-                if end_date:
-                    try:
-                        close_time = datetime.fromisoformat(
-                            end_date.replace("Z", "+00:00")
-                        )
-                    except (ValueError, TypeError):
-                        pass
-
-                condition_id = m.get("conditionId", "")
-
-                market = UnifiedMarket(
-                    platform=Platform.POLYMARKET,
-                    market_id=condition_id,
-                    title=m.get("question", ""),
-                    yes_token_id=yes_token,
-                    no_token_id=no_token,
-                    close_time=close_time,
-                    raw_data=m,
-                )
-                markets.append(market)
-
-                # Cache token mappings
-                self._token_to_market[yes_token] = (condition_id, "yes")
-                self._token_to_market[no_token] = (condition_id, "no")
-                self._market_tokens[condition_id] = (yes_token, no_token)
+        response = await self._client.post(
+            f"{self.clob_url}/books",
+            content=orjson.dumps([{"token_id": token_id} for token_id in token_ids]),
+            headers={"Content-Type": "application/json"},
+        )
+        response.raise_for_status()
+        return {book.get("asset_id"): book for book in orjson.loads(response.content)}
 
-            offset += limit
-            if len(data) < limit:
-                break
+    def _build_orderbook(
+        self, market_id: str, yes_book: dict[str, Any], no_book: dict[str, Any]
+    ) -> Orderbook:
+        """Build an orderbook from the raw YES and NO token books."""
+        # Sort: bids descending, asks ascending
+        yes_bid_prices, yes_bid_sizes = self._parse_levels(
+            yes_book.get("bids", []), descending=True
+        )
+        yes_ask_prices, yes_ask_sizes = self._parse_levels(
+            yes_book.get("asks", []), descending=False
+        )
+        no_bid_prices, no_bid_sizes = self._parse_levels(
+            no_book.get("bids", []), descending=True
+        )
+        no_ask_prices, no_ask_sizes = self._parse_levels(
+            no_book.get("asks", []), descending=False
+        )
 
-        return markets
+        return Orderbook(
+            market_id=market_id,
+            yes_bid_prices=yes_bid_prices,
+            yes_bid_sizes=yes_bid_sizes,
+            yes_ask_prices=yes_ask_prices,
+            yes_ask_sizes=yes_ask_sizes,
+            no_bid_prices=no_bid_prices,
+            no_bid_sizes=no_bid_sizes,
+            no_ask_prices=no_ask_prices,
+            no_ask_sizes=no_ask_sizes,
+        )
 
     async def get_orderbook(self, market: UnifiedMarket) -> Optional[Orderbook]:
         """Fetch orderbook for a Polymarket market using CLOB API."""
-        yes_token_id = market.yes_token_id
-        no_token_id = market.no_token_id
-
-        if not yes_token_id or not no_token_id:
-            # Try to get from cache
-            tokens = self._market_tokens.get(market.market_id)
-            if tokens:
-                yes_token_id, no_token_id = tokens
-            else:
-                return None
-
-        # Fetch orderbooks for both tokens
-        await self.rate_limiter.acquire()
+        tokens = self._tokens(market)
+        if not tokens:
+            return None
+        yes_token_id, no_token_id = tokens
 
+        # Fetch orderbooks for both tokens in a single batched request
         try:
-            yes_response = await self._client.get(
-                f"{self.clob_url}/book", params={"token_id": yes_token_id}
-            )
-            yes_response.raise_for_status()
-            yes_book = yes_response.json()
+            books = await self._fetch_books([yes_token_id, no_token_id])
         except httpx.HTTPError:
-            yes_book = {}
+            books = {}
 
-        await self.rate_limiter.acquire()
-
-        try:
-            no_response = await self._client.get(
-                f"{self.clob_url}/book", params={"token_id": no_token_id}
-            )
-            no_response.raise_for_status()
-            no_book = no_response.json()
-        except httpx.HTTPError:
-            no_book = {}
-
-        # Parse orderbook data
-        yes_bids = []
-        yes_asks = []
-        no_bids = []
-        no_asks = []
-
-        for b in yes_book.get("bids", []):
-            try:
-                price = float(b.get("price", 0))
-                size = float(b.get("size", 0))
-                yes_bids.append(OrderbookLevel(price=price, size=size))
-            except (ValueError, TypeError):
-                continue
-
-        for a in yes_book.get("asks", []):
-            try:
-                price = float(a.get("price", 0))
-                size = float(a.get("size", 0))
-                yes_asks.append(OrderbookLevel(price=price, size=size))
-            except (ValueError, TypeError):
-                continue
-
-        for b in no_book.get("bids", []):
-            try:
-                price = float(b.get("price", 0))
-                size = float(b.get("size", 0))
-                no_bids.append(OrderbookLevel(price=price, size=size))
-            except (ValueError, TypeError):
-                continue
+        return self._build_orderbook(
+            market.market_id, books.get(yes_token_id, {}), books.get(no_token_id, {})
+        )
 
-        for a in no_book.get("asks", []):
-            try:
-                price = float(a.get("price", 0))
-                size = float(a.get("size", 0))
-                no_asks.append(OrderbookLevel(price=price, size=size))
-            except (ValueError, TypeError):
+    async def get_orderbooks(
+        self, markets: list[UnifiedMarket], max_concurrency: int = 16
+    ) -> dict[str, Orderbook]:
+        """
+        Fetch orderbooks for many markets through bulk /books requests.
+
+        Tokens are sent _BOOKS_BATCH_SIZE per request, with at most
+        max_concurrency requests in flight. Markets whose request failed
+        are left out of the result.
+
+        Returns:
+            Orderbooks keyed by market_id.
+        """
+        tokens = {}
+        for market in markets:
+            market_tokens = self._tokens(market)
+            if market_tokens:
+                tokens[market.market_id] = market_tokens
+
+        token_ids = [token_id for pair in tokens.values() for token_id in pair]
+        chunks = [
+            token_ids[i:i + _BOOKS_BATCH_SIZE]
+            for i in range(0, len(token_ids), _BOOKS_BATCH_SIZE)
+        ]
+
+        sem = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(chunk: list[str]) -> dict[str, dict[str, Any]]:
+            async with sem:
+                return await self._fetch_books(chunk)
+
+        results = await asyncio.gather(*map(fetch, chunks), return_exceptions=True)
+
+        books: dict[str, dict[str, Any]] = {}
+        fetched: set[str] = set()
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, BaseException):
                 continue
+            books.update(result)
+            fetched.update(chunk)
 
-        # Sort: bids descending, asks ascending
-        yes_bids.sort(key=lambda x: x.price, reverse=True)
-        yes_asks.sort(key=lambda x: x.price)
-        no_bids.sort(key=lambda x: x.price, reverse=True)
-        no_asks.sort(key=lambda x: x.price)
-
-        return Orderbook(
-            market_id=market.market_id,
-            yes_bids=yes_bids,
-            yes_asks=yes_asks,
-            no_bids=no_bids,
-            no_asks=no_asks,
-        )
+        return {
+            market_id: self._build_orderbook(
+                market_id, books.get(yes_token_id, {}), books.get(no_token_id, {})
+            )
+            for market_id, (yes_token_id, no_token_id) in tokens.items()
+            if yes_token_id in fetched and no_token_id in fetched
+        }
 
     async def close(self):
-        """Close the HTTP client."""
-        await self._client.aclose()
+        """Close the HTTP client, unless it was passed in."""
+        if self._owns_client:
+            await self._client.aclose()
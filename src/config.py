@@ -28,9 +28,21 @@ class Settings(BaseSettings):
     fuzzy_match_threshold: int = Field(
         default=80, validation_alias="FUZZY_MATCH_THRESHOLD"
     )
+    max_opportunities: int = Field(
+        default=0, validation_alias="MAX_OPPORTUNITIES"
+    )
+    warm_cost_threshold: float = Field(
+        default=1.05, validation_alias="WARM_COST_THRESHOLD"
+    )
+    cold_refetch_seconds: float = Field(
+        default=300, validation_alias="COLD_REFETCH_SECONDS"
+    )
 
     # Rate Limiting
     kalshi_requests_per_second: float = 5.0
     poly_requests_per_second: float = 10.0
+    # Max in-flight orderbook requests per platform
+    kalshi_max_concurrency: int = 16
+    poly_max_concurrency: int = 16
 
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8", "extra": "ignore"}
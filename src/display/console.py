@@ -1,19 +1,44 @@
 from datetime import datetime
+from typing import Optional
 
-from rich.console import Console
+from rich.console import Console, Group, RenderableType
+from rich.live import Live
 from rich.table import Table
 from rich import box
 from rich.panel import Panel
+from rich.style import Style
+from rich.text import Text
 
 from ..models.arbitrage import ArbitrageOpportunity
 from ..models.market import Platform
 
 
+# Cell styles, built once so rows skip markup parsing
+GREEN = Style(color="green")
+GREEN_BOLD = Style(color="green", bold=True)
+YELLOW = Style(color="yellow")
+CYAN = Style(color="cyan")
+BLUE = Style(color="blue")
+DIM = Style(dim=True)
+
+
 class ArbotDisplay:
     """Console display manager for the arbitrage bot."""
 
     def __init__(self):
         self.console = Console()
+        self._live: Optional[Live] = None
+
+        # Latest dashboard parts, reused across redraws
+        self._header = Panel(
+            "[bold white]Polymarket-Kalshi Arbitrage Bot[/bold white]\n"
+            "[dim]Scanning for arbitrage opportunities...[/dim]",
+            style="cyan",
+        )
+        self._status_table: Optional[Table] = None
+        self._arb_renderable: RenderableType = ""
+        self._arb_snapshot: Optional[tuple] = None
+        self._status_line = ""
 
     def _create_arbitrage_table(
         self, opportunities: list[ArbitrageOpportunity]
@@ -45,9 +70,9 @@ class ArbotDisplay:
                 title = title[:41] + ".."
 
             # Add each level as a row
-            for lvl_idx, lvl in enumerate(opp.levels):
-                yes_plat = "K" if lvl.buy_yes_platform == Platform.KALSHI else "P"
-                no_plat = "K" if lvl.buy_no_platform == Platform.KALSHI else "P"
+            for lvl_idx, lvl in enumerate(opp):
+                yes_plat = "K" if lvl.buy_yes_platform is Platform.KALSHI else "P"
+                no_plat = "K" if lvl.buy_no_platform is Platform.KALSHI else "P"
                 strategy = (
                     f"YES@{yes_plat}({lvl.buy_yes_price:.1%}) + "
                     f"NO@{no_plat}({lvl.buy_no_price:.1%})"
@@ -55,20 +80,26 @@ class ArbotDisplay:
 
                 if lvl_idx == 0:
                     # First row: show market info
-                    market_cell = f"{title}\n[dim]K: {kalshi_url}[/dim]\n[dim]P: {poly_url}[/dim]"
-                    row_num = str(i)
+                    market_cell = Text.assemble(
+                        title,
+                        "\n",
+                        (f"K: {kalshi_url}", DIM),
+                        "\n",
+                        (f"P: {poly_url}", DIM),
+                    )
+                    row_num = Text(str(i))
                 else:
                     # Subsequent rows: empty market info
-                    market_cell = ""
-                    row_num = ""
+                    market_cell = Text()
+                    row_num = Text()
 
                 table.add_row(
                     row_num,
                     market_cell,
-                    strategy,
-                    f"{lvl.quantity:.0f}",
-                    f"[green]{lvl.profit_percentage:.1%}[/green]",
-                    f"[yellow]${lvl.max_profit_dollars:.2f}[/yellow]",
+                    Text(strategy),
+                    Text(f"{lvl.quantity:.0f}"),
+                    Text(f"{lvl.profit_percentage:.1%}", style=GREEN),
+                    Text(f"${lvl.max_profit_dollars:.2f}", style=YELLOW),
                 )
 
         return table
@@ -86,15 +117,27 @@ class ArbotDisplay:
         table.add_column("Metric", style="dim")
         table.add_column("Value", justify="right")
 
-        table.add_row("Kalshi Markets", f"[cyan]{kalshi_count}[/cyan]")
-        table.add_row("Polymarket Markets", f"[blue]{poly_count}[/blue]")
-        table.add_row("Matched Pairs", f"[yellow]{matched_count}[/yellow]")
-        table.add_row("Markets w/ Arb (>=2%)", f"[green bold]{opportunity_count}[/green bold]")
-        table.add_row("Total Arb Levels", f"[green]{level_count}[/green]")
-        table.add_row("Last Update", f"[dim]{datetime.now().strftime('%H:%M:%S')}[/dim]")
+        table.add_row(Text("Kalshi Markets"), Text(str(kalshi_count), style=CYAN))
+        table.add_row(Text("Polymarket Markets"), Text(str(poly_count), style=BLUE))
+        table.add_row(Text("Matched Pairs"), Text(str(matched_count), style=YELLOW))
+        table.add_row(
+            Text("Markets w/ Arb (>=2%)"), Text(str(opportunity_count), style=GREEN_BOLD)
+        )
+        table.add_row(Text("Total Arb Levels"), Text(str(level_count), style=GREEN))
+        table.add_row(
+            Text("Last Update"), Text(datetime.now().strftime("%H:%M:%S"), style=DIM)
+        )
 
         return table
 
+    def _render(self) -> Group:
+        """Compose the full dashboard from the latest parts."""
+        parts = [self._header, self._status_table, "", self._arb_renderable, ""]
+        if self._status_line:
+            parts.append(f"[cyan]Info:[/cyan] {self._status_line}")
+        parts.append("[dim]Press Ctrl+C to stop[/dim]")
+        return Group(*parts)
+
     def clear_and_display(
         self,
         opportunities: list[ArbitrageOpportunity],
@@ -102,53 +145,68 @@ class ArbotDisplay:
         poly_count: int,
         matched_count: int,
     ):
-        """Clear console and display current state."""
-        # Only clear in interactive mode
-        if self.console.is_terminal:
-            self.console.clear()
-
-        # Header
-        self.console.print(
-            Panel(
-                "[bold white]Polymarket-Kalshi Arbitrage Bot[/bold white]\n"
-                "[dim]Scanning for arbitrage opportunities...[/dim]",
-                style="cyan",
-            )
-        )
-
+        """Display current state, redrawing the live dashboard in place."""
         # Count total levels across all opportunities
         total_levels = sum(len(opp.levels) for opp in opportunities)
 
         # Status summary
-        status_table = self._create_status_table(
+        self._status_table = self._create_status_table(
             kalshi_count=kalshi_count,
             poly_count=poly_count,
             matched_count=matched_count,
             opportunity_count=len(opportunities),
             level_count=total_levels,
         )
-        self.console.print(status_table)
-        self.console.print()
 
-        # Opportunities table
-        if opportunities:
-            arb_table = self._create_arbitrage_table(opportunities)
-            self.console.print(arb_table)
-        else:
-            self.console.print(
-                "[dim]No arbitrage opportunities found above 2% threshold.[/dim]"
+        # Opportunities table, rebuilt only when the opportunities changed
+        snapshot = tuple(
+            (opp.kalshi_market.market_id, opp.poly_market.market_id, opp.levels.tobytes())
+            for opp in opportunities
+        )
+        if snapshot != self._arb_snapshot:
+            self._arb_snapshot = snapshot
+            if opportunities:
+                self._arb_renderable = self._create_arbitrage_table(opportunities)
+            else:
+                self._arb_renderable = (
+                    "[dim]No arbitrage opportunities found above 2% threshold.[/dim]"
+                )
+
+        # Only redraw in place in interactive mode
+        if not self.console.is_terminal:
+            self.console.print(self._render())
+        elif self._live is None:
+            self._live = Live(
+                self._render(),
+                console=self.console,
+                auto_refresh=False,
             )
+            self.console.clear()
+            self._live.start(refresh=True)
+        else:
+            self._live.update(self._render(), refresh=True)
 
-        self.console.print()
-        self.console.print("[dim]Press Ctrl+C to stop[/dim]")
+    def close(self):
+        """Stop the live dashboard, leaving its last state on screen."""
+        if self._live is not None:
+            self._live.stop()
+            self._live = None
 
     def show_error(self, message: str):
         """Display an error message."""
         self.console.print(f"[red bold]Error:[/red bold] {message}")
 
     def show_info(self, message: str):
-        """Display an info message."""
-        self.console.print(f"[cyan]Info:[/cyan] {message}")
+        """
+        Display an info message.
+
+        While the dashboard is live, the message only becomes its footer
+        and is drawn with the next dashboard update.
+        """
+        if self._live is not None:
+            self._status_line = message
+        else:
+            self.console.print(f"[cyan]Info:[/cyan] {message}")
 
     def show_warning(self, message: str):
         """Display a warning message."""
@@ -1,18 +1,40 @@
 import asyncio
 import signal
 import sys
+import time
+from functools import lru_cache
 from pathlib import Path
+from typing import Awaitable, TypeVar
 
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
 from dotenv import load_dotenv
 
 from .config import Settings
+from .clients.http import create_http_client
 from .clients.kalshi_client import KalshiClient
 from .clients.polymarket_client import PolymarketClient
-from .matching.fuzzy_matcher import FuzzyMatcher
+from .matching.fuzzy_matcher import FuzzyMatcher, MarketPair
+from .models.orderbook import Orderbook
 from .arbitrage.calculator import ArbitrageCalculator
 from .display.console import ArbotDisplay
 
 
+T = TypeVar("T")
+
+
+@lru_cache
+def _load_private_key(path: Path) -> rsa.RSAPrivateKey:
+    """Read and parse a PEM private key; PEM parsing is CPU-heavy."""
+    return serialization.load_pem_private_key(path.read_bytes(), password=None)
+
+
+async def _bounded(sem: asyncio.Semaphore, coro: Awaitable[T]) -> T:
+    """Await a coroutine while holding a semaphore slot."""
+    async with sem:
+        return await coro
+
+
 class ArbitrageBot:
     """Main arbitrage bot orchestrator."""
 
@@ -21,15 +43,17 @@ class ArbitrageBot:
         self.running = False
         self.display = ArbotDisplay()
 
-        # Load Kalshi private key
-        private_key_pem = settings.kalshi_private_key_path.read_text()
+        # Load Kalshi private key, parsed only once per path
+        private_key = _load_private_key(settings.kalshi_private_key_path)
 
-        # Initialize clients
+        # Initialize clients on one shared connection pool
+        self.http_client = create_http_client()
         self.kalshi_client = KalshiClient(
             api_key_id=settings.kalshi_api_key_id,
-            private_key_pem=private_key_pem,
+            private_key=private_key,
             base_url=settings.kalshi_base_url,
             requests_per_second=settings.kalshi_requests_per_second,
+            http_client=self.http_client,
         )
 
         self.poly_client = PolymarketClient(
@@ -39,8 +63,16 @@ class ArbitrageBot:
             secret=settings.poly_secret,
             passphrase=settings.poly_passphrase,
             requests_per_second=settings.poly_requests_per_second,
+            http_client=self.http_client,
         )
 
+        # Bound concurrent Kalshi orderbook requests; Polymarket bounds its
+        # bulk requests itself
+        self._kalshi_sem = asyncio.Semaphore(settings.kalshi_max_concurrency)
+
+        # Best YES + NO cost and fetch time of each pair's last orderbooks
+        self._pair_state: dict[str, tuple[float, float]] = {}
+
         # Initialize components
         self.matcher = FuzzyMatcher(threshold=settings.fuzzy_match_threshold)
         self.calculator = ArbitrageCalculator(
@@ -72,6 +104,17 @@ class ArbitrageBot:
 
         await self._cleanup()
 
+    def _should_refetch(self, pair: MarketPair, now: float) -> bool:
+        """Whether a pair's orderbooks are worth fetching this cycle."""
+        state = self._pair_state.get(pair.pair_id)
+        if state is None:
+            return True
+        last_cost, last_fetched = state
+        return (
+            last_cost < self.settings.warm_cost_threshold
+            or now - last_fetched >= self.settings.cold_refetch_seconds
+        )
+
     async def _poll_cycle(self):
         """Single polling cycle: fetch, match, calculate, display."""
         # 1. Fetch markets from both platforms concurrently
@@ -94,33 +137,61 @@ class ArbitrageBot:
         pairs = self.matcher.find_matches(kalshi_markets, poly_markets)
         self.display.show_info(f"Found {len(pairs)} matched pairs")
 
-        # 3. Fetch orderbooks for matched pairs
+        # 3. Fetch orderbooks for matched pairs, skipping pairs that were
+        # far from arbitrage last time until they go cold
+        now = time.monotonic()
+        self._pair_state = {
+            p.pair_id: self._pair_state[p.pair_id]
+            for p in pairs
+            if p.pair_id in self._pair_state
+        }
+        fetch_pairs = [p for p in pairs if self._should_refetch(p, now)]
+
         kalshi_orderbooks = {}
         poly_orderbooks = {}
 
-        if pairs:
-            self.display.show_info(f"Fetching orderbooks for {len(pairs)} pairs...")
+        if fetch_pairs:
+            self.display.show_info(
+                f"Fetching orderbooks for {len(fetch_pairs)} of {len(pairs)} pairs..."
+            )
 
-            # Fetch orderbooks concurrently
+            # Fetch both platforms' orderbooks in one concurrent batch, with
+            # in-flight requests bounded per platform. Kalshi has no bulk
+            # endpoint; Polymarket books come through bulk /books requests.
             kalshi_tasks = [
-                self.kalshi_client.get_orderbook(p.kalshi_market.market_id)
-                for p in pairs
-            ]
-            poly_tasks = [
-                self.poly_client.get_orderbook(p.poly_market)
-                for p in pairs
+                _bounded(
+                    self._kalshi_sem,
+                    self.kalshi_client.get_orderbook(p.kalshi_market.market_id),
+                )
+                for p in fetch_pairs
             ]
+            poly_task = self.poly_client.get_orderbooks(
+                [p.poly_market for p in fetch_pairs],
+                max_concurrency=self.settings.poly_max_concurrency,
+            )
 
-            kalshi_results = await asyncio.gather(*kalshi_tasks, return_exceptions=True)
-            poly_results = await asyncio.gather(*poly_tasks, return_exceptions=True)
-
-            for pair, result in zip(pairs, kalshi_results):
-                if not isinstance(result, Exception) and result:
-                    kalshi_orderbooks[pair.kalshi_market.market_id] = result
+            *kalshi_results, poly_result = await asyncio.gather(
+                *kalshi_tasks, poly_task, return_exceptions=True
+            )
 
-            for pair, result in zip(pairs, poly_results):
-                if not isinstance(result, Exception) and result:
-                    poly_orderbooks[pair.poly_market.market_id] = result
+            if type(poly_result) is dict:
+                poly_orderbooks = poly_result
+
+            # One pass collects Kalshi books and records how close each
+            # fetched pair was; failed fetches (exceptions, or a missing
+            # Polymarket book) leave the pair's state alone so it is
+            # retried next cycle
+            for pair, kalshi_book in zip(fetch_pairs, kalshi_results):
+                if type(kalshi_book) is not Orderbook:
+                    continue
+                kalshi_orderbooks[pair.kalshi_market.market_id] = kalshi_book
+
+                poly_book = poly_orderbooks.get(pair.poly_market.market_id)
+                if poly_book is not None:
+                    self._pair_state[pair.pair_id] = (
+                        ArbitrageCalculator.best_total_cost(kalshi_book, poly_book),
+                        now,
+                    )
 
             self.display.show_info(
                 f"Got {len(kalshi_orderbooks)} Kalshi and {len(poly_orderbooks)} Polymarket orderbooks"
@@ -128,7 +199,10 @@ class ArbitrageBot:
 
         # 4. Calculate arbitrage opportunities
         opportunities = self.calculator.find_all_opportunities(
-            pairs, kalshi_orderbooks, poly_orderbooks
+            fetch_pairs,
+            kalshi_orderbooks,
+            poly_orderbooks,
+            top_k=self.settings.max_opportunities,
         )
 
         # 5. Display results
@@ -143,6 +217,8 @@ class ArbitrageBot:
         """Cleanup resources."""
         await self.kalshi_client.close()
         await self.poly_client.close()
+        await self.http_client.aclose()
+        self.display.close()
         self.display.show_info("Bot stopped.")
 
     def stop(self):
@@ -172,8 +248,13 @@ def main():
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
 
-    # Run the bot
-    asyncio.run(bot.run())
+    # Run the bot, on uvloop where it is installed (not available on Windows)
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(bot.run())
+    else:
+        uvloop.run(bot.run())
 
 
 if __name__ == "__main__":
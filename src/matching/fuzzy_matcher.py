@@ -1,12 +1,77 @@
 from dataclasses import dataclass
 import numpy as np
 from rapidfuzz import fuzz
-from rapidfuzz.process import cdist
+from rapidfuzz.process import cdist, cpdist
+from scipy import sparse
+from scipy.optimize import linear_sum_assignment
+from scipy.sparse.csgraph import connected_components
 
 from ..models.market import UnifiedMarket
 
 
-@dataclass
+# Assignment cost of a below-threshold pair, above any sum of valid costs
+_BELOW_THRESHOLD_COST = 1e9
+
+# MinHash over character trigrams: _NUM_HASHES multiply-shift hashes
+# ((a * x + b) mod 2**64) >> 32, which fit in uint32, banded for LSH into
+# _NUM_BANDS bands of _BAND_ROWS. Pairs agreeing on every hash of some
+# band are candidates, so a pair with trigram Jaccard J survives with
+# 1 - (1 - J**4)**64 (98% at J = 0.5, 81% at J = 0.4).
+_NUM_HASHES = 256
+_BAND_ROWS = 4
+_NUM_BANDS = _NUM_HASHES // _BAND_ROWS
+_rng = np.random.default_rng(0)
+_HASH_A = _rng.integers(0, 1 << 64, _NUM_HASHES, dtype=np.uint64) | np.uint64(1)
+_HASH_B = _rng.integers(0, 1 << 64, _NUM_HASHES, dtype=np.uint64)
+# Titles shorter than a trigram have no signature and are never
+# candidates; this placeholder only keeps the signature stack rectangular
+_EMPTY_SIGNATURE = np.zeros(_NUM_HASHES, dtype=np.uint32)
+# Odd 64-bit constant mixing a band's hash values into one key
+_BAND_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+# Candidates whose signatures agree on a smaller fraction of hashes than
+# this (an estimate of their Jaccard similarity) are dropped unscored
+_MIN_JACCARD = 0.2
+# Candidate pairs per Jaccard estimate, bounding the comparison buffer
+_ESTIMATE_CHUNK = 1 << 16
+# Bands whose candidate pairs are deduplicated together
+_BANDS_PER_MERGE = 8
+# Once candidates reach this fraction of all pairs, blocking costs more
+# than it saves (templated titles collide in most bands), so every pair
+# is scored densely instead
+_DENSE_FRACTION = 0.1
+
+
+def _band_keys(signatures: np.ndarray) -> np.ndarray:
+    """Hash each band of each signature into one uint64 key."""
+    bands = signatures.reshape(len(signatures), _NUM_BANDS, _BAND_ROWS)
+    bands = bands.astype(np.uint64)
+    keys = bands[:, :, 0].copy()
+    for j in range(1, _BAND_ROWS):
+        # Wrapping polynomial hash over the band's values
+        keys = keys * _BAND_MULTIPLIER + bands[:, :, j]
+    return keys
+
+
+def _join(
+    k_keys: np.ndarray, p_keys: np.ndarray, limit: float
+) -> tuple[np.ndarray, np.ndarray] | None:
+    """All (k, p) index pairs whose keys are equal, or None past `limit`."""
+    order = np.argsort(p_keys, kind="stable")
+    sorted_keys = p_keys[order]
+    lo = np.searchsorted(sorted_keys, k_keys, side="left")
+    counts = np.searchsorted(sorted_keys, k_keys, side="right") - lo
+    if counts.sum() >= limit:
+        return None
+
+    rows = np.repeat(np.arange(len(k_keys)), counts)
+    # Position within each k key's run of equal p keys
+    run_starts = np.cumsum(counts) - counts
+    within = np.arange(len(rows)) - np.repeat(run_starts, counts)
+    return rows, order[np.repeat(lo, counts) + within]
+
+
+@dataclass(slots=True)
 class MarketPair:
     """A matched pair of markets from different platforms."""
 
@@ -29,6 +94,260 @@ class FuzzyMatcher:
         """
         self.threshold = threshold
 
+        # Above-threshold scores from the last call as a sparse matrix,
+        # reused across polls since the market universe changes slowly.
+        # Rows/columns are keyed by market_id through the *_rows/*_cols maps.
+        self._k_titles: dict[str, str] = {}
+        self._p_titles: dict[str, str] = {}
+        self._k_rows: dict[str, int] = {}
+        self._p_cols: dict[str, int] = {}
+        self._scores: sparse.csr_matrix | None = None
+
+        # MinHash signature of each current title
+        self._signatures: dict[str, np.ndarray] = {}
+
+    @staticmethod
+    def _cached_positions(
+        markets: list[UnifiedMarket],
+        titles: list[str],
+        cached_titles: dict[str, str],
+        cached_positions: dict[str, int],
+    ) -> np.ndarray:
+        """Position of each market in the cached matrix, or -1 if new/changed."""
+        return np.array(
+            [
+                cached_positions[m.market_id]
+                if cached_titles.get(m.market_id) == title
+                else -1
+                for m, title in zip(markets, titles)
+            ],
+            dtype=np.intp,
+        )
+
+    def _signature(self, title: str) -> np.ndarray:
+        """MinHash signature of the distinct character trigrams in a title."""
+        signature = self._signatures.get(title)
+        if signature is None:
+            if len(title) < 3:
+                signature = _EMPTY_SIGNATURE
+            else:
+                # Pack each trigram's code points (21 bits each) into one int
+                codes = np.frombuffer(title.encode("utf-32-le"), dtype=np.uint32)
+                codes = codes.astype(np.uint64)
+                grams = np.unique(
+                    (codes[:-2] << np.uint64(42))
+                    | (codes[1:-1] << np.uint64(21))
+                    | codes[2:]
+                )
+                hashes = (grams[:, None] * _HASH_A + _HASH_B) >> np.uint64(32)
+                signature = hashes.min(axis=0).astype(np.uint32)
+            self._signatures[title] = signature
+        return signature
+
+    def _candidates(
+        self, kalshi_titles: list[str], poly_titles: list[str]
+    ) -> tuple[np.ndarray, np.ndarray] | None:
+        """
+        Pairs whose titles look similar enough to be worth scoring.
+
+        Candidates come from MinHash LSH banding over character trigrams,
+        which costs O(N + M) per band, then pairs whose signatures
+        estimate a Jaccard similarity below _MIN_JACCARD are dropped.
+        Returns None when candidates approach _DENSE_FRACTION of all
+        pairs, in which case dense scoring is cheaper.
+        """
+        k_sigs = np.stack([self._signature(title) for title in kalshi_titles])
+        p_sigs = np.stack([self._signature(title) for title in poly_titles])
+        k_valid = np.flatnonzero([len(title) >= 3 for title in kalshi_titles])
+        p_valid = np.flatnonzero([len(title) >= 3 for title in poly_titles])
+        dense_limit = _DENSE_FRACTION * len(kalshi_titles) * len(poly_titles)
+
+        # Pair ids index the valid titles only, in 32 bits where they fit
+        n_p = len(p_valid)
+        id_dtype = np.uint32 if len(k_valid) * n_p < 1 << 32 else np.uint64
+
+        k_keys = _band_keys(k_sigs[k_valid])
+        p_keys = _band_keys(p_sigs[p_valid])
+        pair_ids = np.empty(0, dtype=id_dtype)
+        pending = []
+        for band in range(_NUM_BANDS):
+            joined = _join(k_keys[:, band], p_keys[:, band], dense_limit)
+            if joined is None:
+                return None
+            rows, cols = joined
+            pending.append((rows * n_p + cols).astype(id_dtype))
+
+            # A pair collides in many bands; deduplicate a few bands at a
+            # time so the unsorted backlog stays small
+            if len(pending) == _BANDS_PER_MERGE or band == _NUM_BANDS - 1:
+                pair_ids = np.unique(np.concatenate([pair_ids, *pending]))
+                pending = []
+                if len(pair_ids) >= dense_limit:
+                    return None
+
+        rows, cols = np.divmod(pair_ids.astype(np.intp), n_p)
+        rows, cols = k_valid[rows], p_valid[cols]
+
+        keep = np.empty(len(rows), dtype=bool)
+        for start in range(0, len(rows), _ESTIMATE_CHUNK):
+            stop = start + _ESTIMATE_CHUNK
+            agree = k_sigs[rows[start:stop]] == p_sigs[cols[start:stop]]
+            keep[start:stop] = agree.mean(axis=1) >= _MIN_JACCARD
+        return rows[keep], cols[keep]
+
+    def _score_dense(
+        self, kalshi_titles: list[str], poly_titles: list[str]
+    ) -> sparse.coo_matrix:
+        """Score every pair of titles using all CPU cores."""
+        # Same scorer and cutoff as the candidate path in _score
+        scores = cdist(
+            kalshi_titles,
+            poly_titles,
+            scorer=fuzz.ratio,
+            dtype=np.uint8,
+            score_cutoff=self.threshold,
+            workers=-1,
+        )
+        rows, cols = np.nonzero(scores >= self.threshold)
+        return sparse.coo_matrix(
+            (scores[rows, cols], (rows, cols)), shape=scores.shape
+        )
+
+    def _score(
+        self, kalshi_titles: list[str], poly_titles: list[str]
+    ) -> sparse.coo_matrix:
+        """Score candidate pairs using all CPU cores."""
+        candidates = self._candidates(kalshi_titles, poly_titles)
+        if candidates is None:
+            return self._score_dense(kalshi_titles, poly_titles)
+
+        rows, cols = candidates
+        scores = cpdist(
+            [kalshi_titles[i] for i in rows.tolist()],
+            [poly_titles[j] for j in cols.tolist()],
+            # Titles are token-sorted already, so ratio == token_sort_ratio
+            scorer=fuzz.ratio,
+            # Whole-number scores, a quarter of float32's size. rapidfuzz
+            # rounds them to the nearest integer, so without the cutoff a
+            # 79.5 would pass a threshold of 80
+            dtype=np.uint8,
+            # Applied to the unrounded score, keeping the threshold exact.
+            # Also lets rapidfuzz skip pairs whose lengths already rule out
+            # the threshold and exit early on the rest; they score 0
+            score_cutoff=self.threshold,
+            workers=-1,  # Use all CPU cores
+        )
+        keep = scores >= self.threshold
+        return sparse.coo_matrix(
+            (scores[keep], (rows[keep], cols[keep])),
+            shape=(len(kalshi_titles), len(poly_titles)),
+        )
+
+    def _update_scores(
+        self,
+        kalshi_markets: list[UnifiedMarket],
+        poly_markets: list[UnifiedMarket],
+        kalshi_titles: list[str],
+        poly_titles: list[str],
+    ) -> sparse.csr_matrix:
+        """Build the sparse score matrix, scoring only new or changed markets."""
+        # Forget signatures of titles no longer listed
+        current = set(kalshi_titles).union(poly_titles)
+        self._signatures = {
+            t: sig for t, sig in self._signatures.items() if t in current
+        }
+
+        shape = (len(kalshi_titles), len(poly_titles))
+        if self._scores is None:
+            # With nothing cached every pair is new, and dense scoring beats
+            # candidate generation on a full N x M block
+            scores = self._score_dense(kalshi_titles, poly_titles).tocsr()
+        else:
+            old_rows = self._cached_positions(
+                kalshi_markets, kalshi_titles, self._k_titles, self._k_rows
+            )
+            old_cols = self._cached_positions(
+                poly_markets, poly_titles, self._p_titles, self._p_cols
+            )
+            kept_rows = np.flatnonzero(old_rows >= 0)
+            kept_cols = np.flatnonzero(old_cols >= 0)
+            new_rows = np.flatnonzero(old_rows < 0)
+            new_cols = np.flatnonzero(old_cols < 0)
+
+            # Unchanged pairs come straight from the cached matrix
+            reused = self._scores[old_rows[kept_rows]][:, old_cols[kept_cols]].tocoo()
+            parts = [(kept_rows[reused.row], kept_cols[reused.col], reused.data)]
+            # New Kalshi markets against every Polymarket market
+            if new_rows.size:
+                block = self._score([kalshi_titles[i] for i in new_rows], poly_titles)
+                parts.append((new_rows[block.row], block.col, block.data))
+            # Remaining Kalshi markets against new Polymarket markets
+            if kept_rows.size and new_cols.size:
+                block = self._score(
+                    [kalshi_titles[i] for i in kept_rows],
+                    [poly_titles[j] for j in new_cols],
+                )
+                parts.append((kept_rows[block.row], new_cols[block.col], block.data))
+
+            rows, cols, data = (np.concatenate(part) for part in zip(*parts))
+            scores = sparse.csr_matrix((data, (rows, cols)), shape=shape)
+
+        self._k_titles = {m.market_id: t for m, t in zip(kalshi_markets, kalshi_titles)}
+        self._p_titles = {m.market_id: t for m, t in zip(poly_markets, poly_titles)}
+        self._k_rows = {m.market_id: i for i, m in enumerate(kalshi_markets)}
+        self._p_cols = {m.market_id: j for j, m in enumerate(poly_markets)}
+        self._scores = scores
+        return scores
+
+    @staticmethod
+    def _assign(
+        rows: np.ndarray, cols: np.ndarray, scores: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Solve the max-score one-to-one assignment over scored pairs.
+
+        The candidate graph splits into small connected components that
+        are independent assignment problems. Single-pair components match
+        directly; the rest are solved densely one at a time.
+        """
+        n_k = int(rows.max()) + 1
+        n_nodes = n_k + int(cols.max()) + 1
+        graph = sparse.coo_matrix(
+            (np.ones(len(rows), dtype=np.int8), (rows, cols + n_k)),
+            shape=(n_nodes, n_nodes),
+        )
+        _, labels = connected_components(graph, directed=False)
+        component = labels[rows]
+        sizes = np.bincount(component)
+
+        single = sizes[component] == 1
+        out = [(rows[single], cols[single], scores[single])]
+
+        multi = np.flatnonzero(~single)
+        multi = multi[np.argsort(component[multi], kind="stable")]
+        bounds = np.flatnonzero(np.diff(component[multi])) + 1
+        for edges in np.split(multi, bounds) if multi.size else []:
+            comp_rows, r_idx = np.unique(rows[edges], return_inverse=True)
+            comp_cols, c_idx = np.unique(cols[edges], return_inverse=True)
+
+            # Maximize total match score; missing pairs cost more than any
+            # full set of real ones, so they are only used as filler
+            cost = np.full((len(comp_rows), len(comp_cols)), _BELOW_THRESHOLD_COST)
+            cost[r_idx, c_idx] = 101.0 - scores[edges]
+            row_ind, col_ind = linear_sum_assignment(cost)
+
+            real = cost[row_ind, col_ind] < _BELOW_THRESHOLD_COST
+            row_ind, col_ind = row_ind[real], col_ind[real]
+            out.append(
+                (
+                    comp_rows[row_ind],
+                    comp_cols[col_ind],
+                    101 - cost[row_ind, col_ind],
+                )
+            )
+
+        return tuple(np.concatenate(part) for part in zip(*out))
+
     def find_matches(
         self,
         kalshi_markets: list[UnifiedMarket],
@@ -37,49 +356,41 @@ class FuzzyMatcher:
         """
         Find matching markets between platforms using fuzzy matching.
 
+        The first call scores every pair densely. Later calls reuse the
+        cached scores and only score new or changed markets, where
+        MinHash blocking keeps the work proportional to the plausible
+        pairs. Blocking speeds up these incremental polls, not the first
+        call; on templated titles it falls back to dense scoring.
+
         Returns:
             List of MarketPair objects with match scores.
         """
         if not kalshi_markets or not poly_markets:
             return []
 
-        # Get normalized titles
-        kalshi_titles = [m.normalized_title for m in kalshi_markets]
-        poly_titles = [m.normalized_title for m in poly_markets]
+        # Get normalized titles with pre-sorted tokens
+        kalshi_titles = [m.token_sorted_title for m in kalshi_markets]
+        poly_titles = [m.token_sorted_title for m in poly_markets]
 
-        # Compute full similarity matrix using all CPU cores
-        # Shape: (len(kalshi_titles), len(poly_titles))
-        scores = cdist(
-            kalshi_titles,
-            poly_titles,
-            scorer=fuzz.token_sort_ratio,
-            workers=-1,  # Use all CPU cores
-        )
+        # Above-threshold scores, shape: (len(kalshi_titles), len(poly_titles))
+        scores = self._update_scores(
+            kalshi_markets, poly_markets, kalshi_titles, poly_titles
+        ).tocoo()
+        if not scores.nnz:
+            return []
 
-        # Find best match for each Kalshi market
-        matches = []
-        matched_poly_indices: set[int] = set()
-
-        # Get best poly match for each kalshi market
-        best_poly_indices = np.argmax(scores, axis=1)
-        best_scores = np.max(scores, axis=1)
-
-        # Create pairs, sorted by score (best first)
-        sorted_indices = np.argsort(best_scores)[::-1]
-
-        for kalshi_idx in sorted_indices:
-            poly_idx = best_poly_indices[kalshi_idx]
-            score = best_scores[kalshi_idx]
-
-            # Check threshold and prevent duplicate poly matches
-            if score >= self.threshold and poly_idx not in matched_poly_indices:
-                matches.append(
-                    MarketPair(
-                        kalshi_market=kalshi_markets[kalshi_idx],
-                        poly_market=poly_markets[poly_idx],
-                        match_score=float(score),
-                    )
-                )
-                matched_poly_indices.add(poly_idx)
+        row_ind, col_ind, matched_scores = self._assign(
+            scores.row, scores.col, scores.data.astype(np.float64)
+        )
 
-        return matches
+        # Best matches first; convert to Python scalars in bulk rather
+        # than per pair
+        order = np.argsort(-matched_scores, kind="stable")
+        return [
+            MarketPair(kalshi_markets[r], poly_markets[c], score)
+            for r, c, score in zip(
+                row_ind[order].tolist(),
+                col_ind[order].tolist(),
+                matched_scores[order].tolist(),
+            )
+        ]
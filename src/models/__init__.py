@@ -1,11 +1,10 @@
 from .market import UnifiedMarket, Platform
-from .orderbook import Orderbook, OrderbookLevel
+from .orderbook import Orderbook
 from .arbitrage import ArbitrageOpportunity
 
 __all__ = [
     "UnifiedMarket",
     "Platform",
     "Orderbook",
-    "OrderbookLevel",
     "ArbitrageOpportunity",
 ]
@@ -1,7 +1,30 @@
 from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Iterator
+
+import numpy as np
+
 from .market import UnifiedMarket, Platform
 
 
+# Platforms in the order of their uint8 codes in LEVEL_DTYPE
+PLATFORMS = (Platform.KALSHI, Platform.POLYMARKET)
+PLATFORM_CODES = {platform: code for code, platform in enumerate(PLATFORMS)}
+
+# Packed storage for arbitrage levels, one record per level
+LEVEL_DTYPE = np.dtype(
+    [
+        ("yes_price", "f4"),
+        ("no_price", "f4"),
+        ("qty", "f4"),
+        ("pct", "f4"),
+        ("max", "f4"),
+        ("yes_plat", "u1"),
+        ("no_plat", "u1"),
+    ]
+)
+
+
 @dataclass
 class ArbitrageLevel:
     """A single price level in an arbitrage opportunity."""
@@ -15,8 +38,24 @@ class ArbitrageLevel:
     profit_percentage: float  # Gross profit % at this level
     max_profit_dollars: float  # quantity * profit per contract
 
+    @classmethod
+    def from_record(cls, record: np.void) -> "ArbitrageLevel":
+        """Build a level from a LEVEL_DTYPE record."""
+        yes_price = float(record["yes_price"])
+        no_price = float(record["no_price"])
+        return cls(
+            buy_yes_platform=PLATFORMS[record["yes_plat"]],
+            buy_yes_price=yes_price,
+            buy_no_platform=PLATFORMS[record["no_plat"]],
+            buy_no_price=no_price,
+            quantity=float(record["qty"]),
+            total_cost=yes_price + no_price,
+            profit_percentage=float(record["pct"]),
+            max_profit_dollars=float(record["max"]),
+        )
 
-@dataclass
+
+@dataclass(eq=False)
 class ArbitrageOpportunity:
     """Represents a potential arbitrage opportunity between two platforms."""
 
@@ -24,28 +63,42 @@ class ArbitrageOpportunity:
     poly_market: UnifiedMarket
     match_score: float  # Fuzzy match confidence (0-100)
 
-    # All profitable levels
-    levels: list[ArbitrageLevel] = field(default_factory=list)
+    # All profitable levels as LEVEL_DTYPE records, best first. Treated as
+    # immutable once built, since the aggregates below are cached.
+    levels: np.ndarray = field(
+        default_factory=lambda: np.empty(0, dtype=LEVEL_DTYPE)
+    )
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def __getitem__(self, idx: int) -> ArbitrageLevel:
+        """Get a level as an ArbitrageLevel, built on demand."""
+        return ArbitrageLevel.from_record(self.levels[idx])
+
+    def __iter__(self) -> Iterator[ArbitrageLevel]:
+        for record in self.levels:
+            yield ArbitrageLevel.from_record(record)
 
     @property
     def best_level(self) -> ArbitrageLevel | None:
         """Get the most profitable level."""
-        return self.levels[0] if self.levels else None
+        return self[0] if len(self.levels) else None
 
-    @property
+    @cached_property
     def total_quantity(self) -> float:
         """Total quantity across all levels."""
-        return sum(lvl.quantity for lvl in self.levels)
+        return float(self.levels["qty"].sum())
 
-    @property
+    @cached_property
     def total_max_profit(self) -> float:
         """Total max profit in dollars across all levels."""
-        return sum(lvl.max_profit_dollars for lvl in self.levels)
+        return float(self.levels["max"].sum())
 
-    @property
+    @cached_property
     def best_profit_percentage(self) -> float:
         """Best profit percentage (from first level)."""
-        return self.levels[0].profit_percentage if self.levels else 0.0
+        return float(self.levels["pct"][0]) if len(self.levels) else 0.0
 
     @property
     def is_profitable(self) -> bool:
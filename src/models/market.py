@@ -1,16 +1,22 @@
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import StrEnum
 from typing import Optional, Any
 from datetime import datetime
 import re
 
 
-class Platform(Enum):
+# Punctuation stripped from titles before matching
+_NON_WORD_RE = re.compile(r"[^\w\s]")
+# Start of the numeric suffix that follows a Kalshi series ticker
+_TICKER_SUFFIX_RE = re.compile(r"-\d")
+
+
+class Platform(StrEnum):
     KALSHI = "kalshi"
     POLYMARKET = "polymarket"
 
 
-@dataclass
+@dataclass(slots=True)
 class UnifiedMarket:
     """Platform-agnostic market representation."""
 
@@ -22,41 +28,37 @@ class UnifiedMarket:
     close_time: Optional[datetime] = None
     yes_ask: Optional[float] = None
     no_ask: Optional[float] = None
+    # URL parts kept at ingest so the raw payload need not be retained
+    event_ticker: Optional[str] = None  # Kalshi
+    event_slug: Optional[str] = None  # Polymarket
     raw_data: Optional[dict[str, Any]] = field(default=None, repr=False)
+    # Title normalized for fuzzy matching, computed once at construction
+    normalized_title: str = field(init=False, repr=False, compare=False)
+    # Normalized title with its words sorted, so a plain ratio matches
+    # token_sort_ratio without re-sorting on every comparison
+    token_sorted_title: str = field(init=False, repr=False, compare=False)
 
-    @property
-    def normalized_title(self) -> str:
-        """Normalize title for fuzzy matching."""
-        title = self.title.lower()
-        title = re.sub(r"[^\w\s]", " ", title)
-        title = " ".join(title.split())
-        return title
+    def __post_init__(self):
+        words = _NON_WORD_RE.sub(" ", self.title.lower()).split()
+        self.normalized_title = " ".join(words)
+        self.token_sorted_title = " ".join(sorted(words))
 
     @property
     def url(self) -> Optional[str]:
         """Get the URL for this market."""
-        if self.platform == Platform.KALSHI and self.raw_data:
+        if self.platform is Platform.KALSHI:
             # Extract series ticker from event_ticker by removing numeric suffixes
             # e.g., KXFRENCHPRES-27 -> KXFRENCHPRES
             # e.g., KXNEXTISRAELPM-45JAN01-YLAP -> KXNEXTISRAELPM
-            event_ticker = self.raw_data.get("event_ticker", "") or self.market_id
+            event_ticker = self.event_ticker or self.market_id
             # Find the first hyphen followed by a digit
             series_ticker = event_ticker
-            match = re.search(r"-\d", event_ticker)
+            match = _TICKER_SUFFIX_RE.search(event_ticker)
             if match:
                 series_ticker = event_ticker[: match.start()]
             return f"https://kalshi.com/markets/{series_ticker.lower()}"
-        elif self.platform == Platform.POLYMARKET and self.raw_data:
-            # Polymarket markets are often part of event groups
-            events = self.raw_data.get("events", [])
-            if events and len(events) > 0:
-                event_slug = events[0].get("slug", "")
-                if event_slug:
-                    return f"https://polymarket.com/event/{event_slug}"
-            # Fallback to direct slug
-            slug = self.raw_data.get("slug", "")
-            if slug:
-                return f"https://polymarket.com/event/{slug}"
+        elif self.platform is Platform.POLYMARKET and self.event_slug:
+            return f"https://polymarket.com/event/{self.event_slug}"
         return None
 
     def __hash__(self):
@@ -65,4 +67,4 @@ class UnifiedMarket:
     def __eq__(self, other):
         if not isinstance(other, UnifiedMarket):
             return False
-        return self.platform == other.platform and self.market_id == other.market_id
+        return self.platform is other.platform and self.market_id == other.market_id
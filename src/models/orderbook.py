@@ -1,37 +1,45 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
+import numpy as np
 
-@dataclass
-class OrderbookLevel:
-    """Single price level in an orderbook."""
 
-    price: float  # 0.0-1.0 scale (probability)
-    size: float  # Number of contracts
+def _empty_side() -> np.ndarray:
+    return np.empty(0, dtype=np.float64)
 
 
 @dataclass
 class Orderbook:
-    """Orderbook for a market."""
+    """
+    Orderbook for a market.
+
+    Each side is a pair of parallel float64 arrays: prices on a 0.0-1.0
+    scale (probability) and sizes in contracts. Bids are sorted by price
+    descending and asks ascending, so index 0 is always the best level.
+    """
 
     market_id: str
-    yes_bids: list[OrderbookLevel]
-    yes_asks: list[OrderbookLevel]
-    no_bids: list[OrderbookLevel]
-    no_asks: list[OrderbookLevel]
+    yes_bid_prices: np.ndarray = field(default_factory=_empty_side)
+    yes_bid_sizes: np.ndarray = field(default_factory=_empty_side)
+    yes_ask_prices: np.ndarray = field(default_factory=_empty_side)
+    yes_ask_sizes: np.ndarray = field(default_factory=_empty_side)
+    no_bid_prices: np.ndarray = field(default_factory=_empty_side)
+    no_bid_sizes: np.ndarray = field(default_factory=_empty_side)
+    no_ask_prices: np.ndarray = field(default_factory=_empty_side)
+    no_ask_sizes: np.ndarray = field(default_factory=_empty_side)
 
     @property
     def best_yes_bid(self) -> Optional[float]:
-        return self.yes_bids[0].price if self.yes_bids else None
+        return float(self.yes_bid_prices[0]) if self.yes_bid_prices.size else None
 
     @property
     def best_yes_ask(self) -> Optional[float]:
-        return self.yes_asks[0].price if self.yes_asks else None
+        return float(self.yes_ask_prices[0]) if self.yes_ask_prices.size else None
 
     @property
     def best_no_bid(self) -> Optional[float]:
-        return self.no_bids[0].price if self.no_bids else None
+        return float(self.no_bid_prices[0]) if self.no_bid_prices.size else None
 
     @property
     def best_no_ask(self) -> Optional[float]:
-        return self.no_asks[0].price if self.no_asks else None
+        return float(self.no_ask_prices[0]) if self.no_ask_prices.size else None